@@ -2,6 +2,7 @@
 # /// script
 # requires-python = ">=3.14"
 # dependencies = [
+#     "brotli",
 #     "requests",
 #     "tqdm",
 # ]
@@ -13,18 +14,34 @@ This script downloads parcel data, land use codes, and buildings data
 from Alexandria's Open Data portal.
 """
 
+import hashlib
+import json
+import os
+import queue
+import shutil
+import struct
+import tempfile
+import threading
 import zipfile
-from pathlib import Path
+import zlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path, PurePosixPath
 import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
 from tqdm import tqdm
+from urllib3.util.retry import Retry
 
 
-# Define data sources
+# Define data sources. An entry may also pin the expected SHA-256 hex digest
+# of the downloaded file under "sha256"; the download fails if it differs.
 DATASETS = {
     "parcels": {
         "url": "https://hub.arcgis.com/api/v3/datasets/ab8f3a147ddc47deb6d82c5afda65708_0/downloads/data?format=shp&spatialRefId=3857&where=1%3D1",
         "filename": "parcels.zip",
         "extract_dir": "parcels",
+        "segments": 4,
     },
     "land_use_codes": {
         "url": "https://hub.arcgis.com/api/v3/datasets/122a2b6d20ea4e1ba8bb831e932ffa56_0/downloads/data?format=csv&spatialRefId=4326&where=1%3D1",
@@ -35,6 +52,7 @@ DATASETS = {
         "url": "https://hub.arcgis.com/api/v3/datasets/aec4d1c6ee894e1b821ff39d30bdfc30_0/downloads/data?format=shp&spatialRefId=3857&where=1%3D1",
         "filename": "buildings.zip",
         "extract_dir": "buildings",
+        "segments": 4,
     },
     "buildings_use": {
         "url": "https://hub.arcgis.com/api/v3/datasets/8ecb044012bf47f0959fee76e9cc559b_0/downloads/data?format=csv&spatialRefId=3857&where=1%3D1",
@@ -48,123 +66,1026 @@ DATASETS = {
     },
 }
 
+# Most connections open at once to any one host, across all worker threads.
+# Large enough for both segmented archives plus the CSVs on hub.arcgis.com.
+MAX_CONNECTIONS_PER_HOST = 16
 
-def download_file(url: str, output_path: Path) -> None:
+# Number of per-host connection pools to keep, including hosts that the
+# download URLs redirect to
+MAX_HOST_POOLS = 8
+
+# (connect, read) timeouts in seconds for each request
+REQUEST_TIMEOUT = (10, 60)
+
+# Number of bytes copied from the response to disk per read
+COPY_CHUNK_SIZE = 1024 * 1024
+
+# Chunks that may be waiting to be written to disk while the next is read
+WRITE_QUEUE_SIZE = 4
+
+# Segmented downloads never split a file into parts smaller than this
+SEGMENT_MIN_SIZE = 8 * 1024 * 1024
+
+# Fixed-size part of a zip local file header (signature, flags, method, CRC,
+# compressed size, name length, extra length; other fields skipped), and the
+# record signatures
+ZIP_LOCAL_HEADER = struct.Struct("<4s2xHH4xII4xHH")
+ZIP_LOCAL_HEADER_SIGNATURE = b"PK\x03\x04"
+ZIP_DATA_DESCRIPTOR_SIGNATURE = b"PK\x07\x08"
+# Records that follow the last member: central directory header, Zip64 end of
+# central directory record, end of central directory record
+ZIP_CENTRAL_DIRECTORY_SIGNATURES = (b"PK\x01\x02", b"PK\x06\x06", b"PK\x05\x06")
+
+# Zip archives smaller than this are buffered in memory; larger ones spill
+# over to an anonymous temporary file
+SPOOL_MAX_SIZE = 64 * 1024 * 1024
+
+# Data lives in data/ at the project root (the parent of the scripts directory)
+DATA_DIR = Path(__file__).parent.parent.joinpath("data")
+
+
+@dataclass(slots=True, frozen=True)
+class DatasetPlan:
+    """Everything needed to download one dataset, resolved ahead of time."""
+
+    name: str
+    url: str
+    output_path: Path
+    # Directory a zip archive is extracted to, or None for plain files
+    final_dir: Path | None
+    meta_path: Path
+    segments: int
+    sha256: str | None
+
+
+def build_plan(datasets: dict, data_dir: Path) -> list[DatasetPlan]:
+    """
+    Resolve the dataset configuration into download plans.
+
+    Args:
+        datasets: Dataset configuration, like DATASETS
+        data_dir: Base data directory
+
+    Returns:
+        list[DatasetPlan]: One plan per dataset, in configuration order
+    """
+    plan = []
+    for name, config in datasets.items():
+        output_path = data_dir.joinpath(config["filename"])
+        extract_dir = config.get("extract_dir")
+        plan.append(
+            DatasetPlan(
+                name=name,
+                url=config["url"],
+                output_path=output_path,
+                final_dir=data_dir.joinpath(extract_dir) if extract_dir else None,
+                meta_path=output_path.with_suffix(".meta.json"),
+                segments=config.get("segments", 1),
+                sha256=config.get("sha256"),
+            )
+        )
+    return plan
+
+
+PLAN = build_plan(DATASETS, DATA_DIR)
+
+
+def progress_bar(total: int, desc: str, initial: int = 0) -> tqdm:
+    """
+    Create a byte-count progress bar for a download.
+
+    Redraws are throttled to twice a second, so frequent update() calls from
+    the download threads only bump a counter instead of repainting the
+    terminal each time.
+
+    Args:
+        total: Expected number of bytes, or 0 if unknown
+        desc: Label for the progress bar
+        initial: Number of bytes already downloaded
+
+    Returns:
+        tqdm: Progress bar, to be used as a context manager
+    """
+    return tqdm(
+        total=total,
+        initial=initial,
+        desc=desc,
+        unit="B",
+        unit_scale=True,
+        unit_divisor=1024,
+        mininterval=0.5,
+    )
+
+
+def body_size(response: requests.Response) -> int:
+    """
+    Get the number of bytes copy_response will write for a response.
+
+    Content-Length counts the bytes on the wire, so for a gzip or brotli
+    encoded response it says nothing about the decoded size.
+
+    Args:
+        response: HTTP response
+
+    Returns:
+        int: Size of the decoded body, or 0 if unknown
+    """
+    if response.headers.get("Content-Encoding", "identity") != "identity":
+        return 0
+    return int(response.headers.get("content-length", 0))
+
+
+def copy_response(response: requests.Response, f, pbar: tqdm, digest=None) -> None:
+    """
+    Copy a streamed response body into a file, updating a progress bar.
+
+    The body is read from the underlying urllib3 stream in large chunks.
+    Reading and writing run on separate threads joined by a small bounded
+    queue, so the next chunk arrives from the network while the previous one
+    is written to disk (both sides release the GIL during I/O). At most
+    WRITE_QUEUE_SIZE chunks are held in memory at once.
+
+    Args:
+        response: Streamed HTTP response
+        f: Binary file object to write to
+        pbar: Progress bar to update with the number of bytes written
+        digest: Optional hashlib object updated with each chunk as it is
+            written, so the file never has to be read back to hash it
+    """
+    # Let urllib3 undo any Content-Encoding (e.g. gzip) while reading
+    response.raw.decode_content = True
+
+    # The body has to pass through Python anyway: every source is HTTPS, so
+    # the bytes on the socket are TLS records that only the ssl module can
+    # decrypt, and os.sendfile can't read from a socket in the first place.
+    # One allocation per 1 MiB chunk is negligible next to that.
+
+    chunk_queue = queue.Queue(maxsize=WRITE_QUEUE_SIZE)
+    errors = []
+
+    def write_chunks():
+        try:
+            for chunk in iter(chunk_queue.get, None):
+                f.write(chunk)
+                if digest is not None:
+                    digest.update(chunk)
+                pbar.update(len(chunk))
+        except Exception as e:
+            errors.append(e)
+            # Keep draining so the reader never blocks on a full queue
+            for _ in iter(chunk_queue.get, None):
+                pass
+
+    writer = threading.Thread(target=write_chunks, daemon=True)
+    writer.start()
+
+    try:
+        while not errors and (chunk := response.raw.read(COPY_CHUNK_SIZE)):
+            chunk_queue.put(chunk)
+    finally:
+        chunk_queue.put(None)
+        writer.join()
+
+    if errors:
+        raise errors[0]
+
+
+def check_sha256(digest, expected: str, name: str) -> None:
+    """
+    Compare a computed SHA-256 digest against the expected one.
+
+    Args:
+        digest: hashlib sha256 object fed with the downloaded bytes
+        expected: Expected hex digest
+        name: Name of the download, for the error message
+
+    Raises:
+        ValueError: If the digests differ
+    """
+    actual = digest.hexdigest()
+    if actual != expected.lower():
+        raise ValueError(
+            f"SHA-256 mismatch for {name}: expected {expected}, got {actual}"
+        )
+
+
+def preallocate(f, size: int) -> None:
+    """
+    Reserve disk space for a file before writing to it.
+
+    Allocating the whole file in one call lets the filesystem pick contiguous
+    extents instead of growing the file chunk by chunk. Does nothing on
+    platforms without posix_fallocate (e.g. macOS) or filesystems that don't
+    support it.
+
+    Args:
+        f: Binary file object backed by a real file descriptor
+        size: Number of bytes to reserve
+    """
+    if not size or not hasattr(os, "posix_fallocate"):
+        return
+    try:
+        os.posix_fallocate(f.fileno(), 0, size)
+    except OSError:
+        pass
+
+
+def create_session() -> requests.Session:
+    """
+    Create an HTTP session shared by all downloads.
+
+    Reusing one session lets urllib3 keep connections alive between requests
+    to the same host (three of the datasets live on hub.arcgis.com), so only
+    the first request to each host pays for the TCP and TLS handshakes.
+    The pool blocks once a host has MAX_CONNECTIONS_PER_HOST connections in
+    use, so concurrent and segmented downloads queue for a free connection
+    rather than flooding one server (and getting rate limited with 429s).
+    Transient server errors are retried with exponential backoff.
+
+    Responses are not content-encoded unless a request asks for it. Zip
+    archives are already compressed, so having the server gzip them again
+    only costs CPU on both ends (and breaks byte ranges).
+
+    Returns:
+        requests.Session: Configured session
+    """
+    session = requests.Session()
+    session.headers.update(
+        {"User-Agent": "chicken-map-alx/1.0", "Accept-Encoding": "identity"}
+    )
+
+    retries = Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+    )
+    adapter = HTTPAdapter(
+        pool_connections=MAX_HOST_POOLS,
+        pool_maxsize=MAX_CONNECTIONS_PER_HOST,
+        pool_block=True,
+        max_retries=retries,
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    return session
+
+
+def range_validator(headers: CaseInsensitiveDict) -> str | None:
+    """
+    Pick the validator to send in If-Range when resuming a download.
+
+    If-Range only accepts a strong ETag or a Last-Modified date, so weak
+    ETags are skipped in favour of the date.
+
+    Args:
+        headers: Headers of the response the partial data came from
+
+    Returns:
+        str | None: The validator, or None if the response had neither
+    """
+    etag = headers.get("ETag")
+    if etag and not etag.startswith("W/"):
+        return etag
+    return headers.get("Last-Modified")
+
+
+def download_file(
+    url: str, output_path: Path, session: requests.Session, sha256: str | None = None
+) -> CaseInsensitiveDict:
     """
     Download a file from a URL with a progress bar.
 
+    Data is written to a ``.part`` file next to the output path and only
+    renamed into place once the transfer completes. If a previous run was
+    interrupted, the download resumes from the end of the partial file with
+    an HTTP Range request instead of starting over. The response's ETag (or
+    Last-Modified date) is saved next to the partial file and sent back in
+    If-Range, so if the file has changed on the server in the meantime it
+    sends the whole new file and the download starts over.
+
+    If an expected SHA-256 digest is given, the file is hashed as it is
+    written and is only renamed into place if the digest matches.
+
     Args:
         url: The URL to download from
         output_path: Path where the file should be saved
+        session: HTTP session to download with
+        sha256: Expected hex digest of the file, if known
+
+    Returns:
+        CaseInsensitiveDict: Headers of the download response
     """
-    print(f"Downloading {output_path.name}...")
+    part_path = output_path.with_suffix(output_path.suffix + ".part")
+    validator_path = output_path.with_suffix(output_path.suffix + ".part.validator")
+    resume = part_path.stat().st_size if part_path.exists() else 0
+    validator = validator_path.read_text() if validator_path.exists() else None
+    if not validator:
+        # No way to tell whether the partial data is still current
+        resume = 0
+
+    # Plain text compresses well, so let the server gzip or brotli-encode
+    # it on the wire (br is offered when the brotli package is installed)
+    headers = {"Accept-Encoding": requests.utils.DEFAULT_ACCEPT_ENCODING}
+    if resume:
+        tqdm.write(f"Resuming {output_path.name} from byte {resume:,}...")
+        # Byte offsets in the partial file refer to the decoded content, so
+        # ask for the unencoded representation when resuming
+        headers = {
+            "Range": f"bytes={resume}-",
+            "If-Range": validator,
+            "Accept-Encoding": "identity",
+        }
+    else:
+        tqdm.write(f"Downloading {output_path.name}...")
+
+    response = session.get(url, stream=True, headers=headers, timeout=REQUEST_TIMEOUT)
+
+    if resume and response.status_code == 416:
+        # The partial file doesn't fit the resource anymore, so start over
+        response.close()
+        part_path.unlink()
+        validator_path.unlink(missing_ok=True)
+        return download_file(url, output_path, session, sha256)
 
-    response = requests.get(url, stream=True)
     response.raise_for_status()
 
-    total_size = int(response.headers.get("content-length", 0))
+    if response.status_code != 206:
+        # Server ignored the Range header, or the file changed since the
+        # partial download, and is sending the whole file
+        resume = 0
+        validator = range_validator(response.headers)
+        if validator:
+            validator_path.write_text(validator)
+        else:
+            validator_path.unlink(missing_ok=True)
+
+    digest = None
+    if sha256:
+        if resume:
+            # Only the bytes already on disk have to be read back
+            with open(part_path, "rb") as f:
+                digest = hashlib.file_digest(f, "sha256")
+        else:
+            digest = hashlib.sha256()
+
+    content_length = body_size(response)
+    total_size = resume + content_length if content_length else 0
 
     with (
-        open(output_path, "wb") as f,
-        tqdm(
-            total=total_size,
-            unit="B",
-            unit_scale=True,
-            unit_divisor=1024,
-        ) as pbar,
+        response,
+        open(part_path, "ab" if resume else "wb") as f,
+        progress_bar(total_size, output_path.name, initial=resume) as pbar,
     ):
-        for chunk in response.iter_content(chunk_size=8192):
-            if chunk:
-                f.write(chunk)
-                pbar.update(len(chunk))
+        copy_response(response, f, pbar, digest)
+
+    if digest is not None:
+        try:
+            check_sha256(digest, sha256, output_path.name)
+        except ValueError:
+            # Don't resume from corrupt data next time
+            part_path.unlink()
+            validator_path.unlink(missing_ok=True)
+            raise
+
+    part_path.replace(output_path)
+    validator_path.unlink(missing_ok=True)
+
+    tqdm.write(f"✓ Downloaded {output_path.name}")
+
+    return response.headers
+
+
+def member_path(extract_to: Path, name: str) -> Path:
+    """
+    Map a zip member name to a path inside the extraction directory.
+
+    Leading slashes and ".." components are dropped, the same way
+    ZipFile.extract sanitizes member names.
 
-    print(f"✓ Downloaded {output_path.name}")
+    Args:
+        extract_to: Directory the archive is extracted to
+        name: Member name as stored in the archive
+
+    Returns:
+        Path: Where the member should be written
+    """
+    parts = [part for part in PurePosixPath(name).parts if part not in ("/", "..")]
+    return extract_to.joinpath(*parts)
 
 
-def extract_zip(zip_path: Path, extract_to: Path) -> None:
+def extract_zip(zip_file, extract_to: Path) -> None:
     """
-    Extract a zip file to a specified directory.
+    Extract a zip archive to a specified directory.
+
+    Members are decompressed in parallel on a thread pool. zlib releases the
+    GIL while inflating, and ZipFile serializes access to the shared archive
+    file internally, so the DEFLATE work spreads across cores.
 
     Args:
-        zip_path: Path to the zip file
+        zip_file: Seekable binary file object containing the archive
         extract_to: Directory to extract contents to
     """
-    print(f"Extracting {zip_path.name}...")
+    with zipfile.ZipFile(zip_file, "r") as zip_ref:
+        members = zip_ref.infolist()
+
+        # Create member directories up front so that worker threads don't
+        # race each other to create them
+        for member in members:
+            member_path(extract_to, member.filename).parent.mkdir(
+                parents=True, exist_ok=True
+            )
+
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            list(
+                executor.map(
+                    lambda member: zip_ref.extract(member, extract_to), members
+                )
+            )
+
+
+class UnsupportedZipStream(Exception):
+    """Raised when an archive can't be extracted from its local headers alone."""
 
-    with zipfile.ZipFile(zip_path, "r") as zip_ref:
-        zip_ref.extractall(extract_to)
 
-    # Remove the zip file after extraction
-    zip_path.unlink()
+class ChunkReader:
+    """Read exact numbers of bytes from an iterator of byte chunks."""
 
-    print(f"✓ Extracted to {extract_to}")
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.pending = b""
 
+    def read(self, size: int) -> bytes:
+        """Read size bytes, or fewer if the stream ends first."""
+        parts = [self.pending]
+        available = len(self.pending)
+        while available < size:
+            chunk = next(self.chunks, b"")
+            if not chunk:
+                break
+            parts.append(chunk)
+            available += len(chunk)
 
-def download_dataset(name: str, config: dict, data_dir: Path) -> None:
+        data = b"".join(parts)
+        self.pending = data[size:]
+        return data[:size]
+
+    def read_chunk(self) -> bytes:
+        """Read whatever comes next, or b"" at the end of the stream."""
+        if self.pending:
+            data, self.pending = self.pending, b""
+            return data
+        return next(self.chunks, b"")
+
+    def unread(self, data: bytes) -> None:
+        """Push data back to be read again."""
+        self.pending = data + self.pending
+
+
+def read_zip64_sizes(extra: bytes) -> tuple[int, int] | None:
     """
-    Download and process a single dataset.
+    Find the Zip64 sizes in a local header's extra field.
 
     Args:
-        name: Name of the dataset
-        config: Configuration dictionary with URL and file information
-        data_dir: Base data directory
+        extra: Extra field bytes of a local file header
+
+    Returns:
+        tuple | None: (size, compressed_size), or None without a Zip64 record
     """
-    print(f"\n{'=' * 60}")
-    print(f"Processing: {name}")
-    print(f"{'=' * 60}")
+    offset = 0
+    while offset + 4 <= len(extra):
+        header_id, length = struct.unpack_from("<HH", extra, offset)
+        if header_id == 0x0001 and length >= 16:
+            return struct.unpack_from("<QQ", extra, offset + 4)
+        offset += 4 + length
+    return None
 
-    filename = config["filename"]
-    url = config["url"]
-    extract_dir = config.get("extract_dir")
 
-    # Determine output path and what to check for existing data
-    if extract_dir:
-        output_path = data_dir.joinpath(filename)
-        final_dir = data_dir.joinpath(extract_dir)
-        check_path = final_dir  # Check if extracted directory exists
-    else:
-        output_path = data_dir.joinpath(filename)
-        final_dir = None
-        check_path = output_path  # Check if file exists
+def extract_zip_stream(chunks, extract_to: Path) -> None:
+    """
+    Extract a zip archive while it is still arriving, in archive order.
+
+    ZipFile needs the central directory at the end of the archive, so it
+    can't start until the download is complete. Every member is also
+    preceded by a local file header, though, which is enough to inflate
+    members one after another straight from the byte stream. CRCs are
+    checked as each member is written.
+
+    Args:
+        chunks: Iterator of archive bytes, in order
+        extract_to: Directory to extract contents to
+
+    Raises:
+        UnsupportedZipStream: If the archive is encrypted or uses a layout
+            that can't be read without the central directory
+        zipfile.BadZipFile: If the stream is truncated or corrupt
+    """
+    reader = ChunkReader(chunks)
+
+    while True:
+        header = reader.read(ZIP_LOCAL_HEADER.size)
+        if header.startswith(ZIP_CENTRAL_DIRECTORY_SIGNATURES):
+            # Reached the central directory
+            break
+        if not header.startswith(ZIP_LOCAL_HEADER_SIGNATURE):
+            # Anything else (including an empty body) isn't a zip archive
+            raise zipfile.BadZipFile("Not a zip archive")
+        if len(header) < ZIP_LOCAL_HEADER.size:
+            raise zipfile.BadZipFile("Truncated local file header")
+
+        _, flags, method, crc, compressed_size, name_length, extra_length = (
+            ZIP_LOCAL_HEADER.unpack(header)
+        )
+        name = reader.read(name_length).decode("utf-8" if flags & 0x800 else "cp437")
+        zip64_sizes = read_zip64_sizes(reader.read(extra_length))
+        if zip64_sizes:
+            _, compressed_size = zip64_sizes
+
+        is_dir = name.endswith("/")
+        has_data_descriptor = flags & 0x08
+        if flags & 0x01:
+            raise UnsupportedZipStream(f"{name} is encrypted")
+        if method not in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED):
+            raise UnsupportedZipStream(f"{name} uses compression method {method}")
+        if method == zipfile.ZIP_STORED and has_data_descriptor and not is_dir:
+            # Stored data has no end marker, and its size comes after it
+            raise UnsupportedZipStream(f"{name} is stored with a data descriptor")
+
+        target = member_path(extract_to, name)
+        checksum = 0
+        if is_dir:
+            target.mkdir(parents=True, exist_ok=True)
+            if not has_data_descriptor:
+                reader.read(compressed_size)
+        else:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            with open(target, "wb") as f:
+                if method == zipfile.ZIP_DEFLATED:
+                    decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+                    while not decompressor.eof:
+                        chunk = reader.read_chunk()
+                        if not chunk:
+                            raise zipfile.BadZipFile(f"Truncated data for {name}")
+                        data = decompressor.decompress(chunk)
+                        f.write(data)
+                        checksum = zlib.crc32(data, checksum)
+                    reader.unread(decompressor.unused_data)
+                else:
+                    remaining = compressed_size
+                    while remaining:
+                        data = reader.read(min(remaining, COPY_CHUNK_SIZE))
+                        if not data:
+                            raise zipfile.BadZipFile(f"Truncated data for {name}")
+                        f.write(data)
+                        checksum = zlib.crc32(data, checksum)
+                        remaining -= len(data)
+
+        if has_data_descriptor:
+            signature = reader.read(4)
+            if signature != ZIP_DATA_DESCRIPTOR_SIGNATURE:
+                reader.unread(signature)
+            (crc,) = struct.unpack("<I", reader.read(4))
+            reader.read(16 if zip64_sizes else 8)
+
+        if checksum != crc:
+            raise zipfile.BadZipFile(f"Bad CRC-32 for {name}")
+
+
+class QueueTee:
+    """Write-only file wrapper that also hands every chunk to a queue."""
+
+    def __init__(self, f, chunk_queue: queue.Queue):
+        self.f = f
+        self.chunk_queue = chunk_queue
+
+    def write(self, data: bytes) -> int:
+        self.chunk_queue.put(data)
+        return self.f.write(data)
+
+
+def download_range(
+    url: str,
+    fd: int,
+    start: int,
+    end: int,
+    session: requests.Session,
+    headers: dict,
+    progress,
+) -> bool:
+    """
+    Download one byte range of a file and write it at its offset.
+
+    Args:
+        url: The URL to download from
+        fd: File descriptor to write into with os.pwrite
+        start: First byte of the range
+        end: Last byte of the range (inclusive)
+        session: HTTP session to download with
+        headers: Extra request headers
+        progress: Callable reporting the number of bytes written
+
+    Returns:
+        bool: False if the server ignored the Range header
+    """
+    range_headers = {**headers, "Range": f"bytes={start}-{end}"}
+    with session.get(
+        url, stream=True, headers=range_headers, timeout=REQUEST_TIMEOUT
+    ) as response:
+        response.raise_for_status()
+        if response.status_code != 206:
+            return False
+
+        offset = start
+        for chunk in response.iter_content(chunk_size=COPY_CHUNK_SIZE):
+            os.pwrite(fd, chunk, offset)
+            offset += len(chunk)
+            progress(len(chunk))
+
+    if offset != end + 1:
+        raise OSError(f"Range {start}-{end} ended early at byte {offset}")
+
+    return True
+
+
+def download_file_segmented(
+    url: str, f, session: requests.Session, num_parts: int, desc: str
+) -> CaseInsensitiveDict | None:
+    """
+    Download a file as several byte ranges fetched in parallel.
+
+    A single TCP stream is often limited by the window size and round-trip
+    time rather than by link bandwidth, so large files download faster over
+    a few connections at once. Each part is written straight to its offset
+    in the (preallocated) output file.
+
+    Args:
+        url: The URL to download from
+        f: Binary file object to write into; must expose a file descriptor
+        session: HTTP session to download with
+        num_parts: Maximum number of parts to split the file into
+        desc: Label for the progress bar
+
+    Returns:
+        CaseInsensitiveDict | None: Headers of the HEAD response, or None if
+            the server (or platform) doesn't support segmented downloads, or
+            the HEAD request failed, and the caller should fall back to a
+            single stream
+    """
+    if not hasattr(os, "pwrite"):
+        return None
+
+    try:
+        head = session.head(url, allow_redirects=True, timeout=REQUEST_TIMEOUT)
+        head.raise_for_status()
+    except requests.RequestException as e:
+        # Some servers (or presigned redirect targets) only answer GET
+        tqdm.write(f"⚠ Could not check {desc} for range support: {e}")
+        return None
+
+    total_size = int(head.headers.get("content-length", 0))
+    num_parts = min(num_parts, total_size // SEGMENT_MIN_SIZE)
+    if head.headers.get("Accept-Ranges") != "bytes" or num_parts < 2:
+        return None
+
+    # Ranges index the raw bytes, so don't let the server encode them, and
+    # make the server send the whole file (200) if it changes mid-download
+    headers = {"Accept-Encoding": "identity"}
+    validator = range_validator(head.headers)
+    if validator:
+        headers["If-Range"] = validator
+
+    part_size = -(-total_size // num_parts)
+    ranges = [
+        (start, min(start + part_size, total_size) - 1)
+        for start in range(0, total_size, part_size)
+    ]
+
+    preallocate(f, total_size)
+    fd = f.fileno()
+
+    with progress_bar(total_size, f"{desc} ({len(ranges)} parts)") as pbar:
+        lock = threading.Lock()
+
+        def progress(n):
+            with lock:
+                pbar.update(n)
+
+        with ThreadPoolExecutor(max_workers=len(ranges)) as executor:
+            # Use the post-redirect URL so each part skips the redirect
+            accepted = list(
+                executor.map(
+                    lambda r: download_range(
+                        head.url, fd, r[0], r[1], session, headers, progress
+                    ),
+                    ranges,
+                )
+            )
+
+    if not all(accepted):
+        return None
+
+    return head.headers
+
+
+def stream_and_extract(
+    url: str, buffer, extract_to: Path, session: requests.Session, digest=None
+) -> tuple[CaseInsensitiveDict, bool]:
+    """
+    Stream a zip archive over a single connection, extracting it on the fly.
+
+    The download thread copies the response into a spooled buffer and hands
+    each chunk to an extractor thread running extract_zip_stream, so that
+    network transfer and decompression overlap instead of running back to
+    back. If the archive can't be extracted from the stream, the extractor
+    gives up quietly and the caller extracts the buffered copy with ZipFile.
+    Any other extraction error is raised once the download has finished.
+
+    Args:
+        url: The URL of the zip archive
+        buffer: SpooledTemporaryFile to write into, from the start
+        extract_to: Directory to extract contents to
+        session: HTTP session to download with
+        digest: Optional hashlib object to feed the archive bytes to
+
+    Returns:
+        tuple: (headers, extracted)
+            - headers: Headers of the download response
+            - extracted: Whether the archive was extracted from the stream
+    """
+    chunk_queue = queue.Queue(maxsize=16)
+    outcome = {"extracted": False, "error": None}
+
+    def extract_from_queue():
+        chunks = iter(chunk_queue.get, None)
+        try:
+            extract_zip_stream(chunks, extract_to)
+            outcome["extracted"] = True
+        except (UnsupportedZipStream, zipfile.BadZipFile):
+            # Not extractable from the stream; the caller uses the buffered copy
+            pass
+        except Exception as e:
+            outcome["error"] = e
+        finally:
+            # Keep draining so the download thread never blocks on the queue
+            for _ in chunks:
+                pass
+
+    extractor = threading.Thread(target=extract_from_queue, daemon=True)
+    extractor.start()
+
+    try:
+        with session.get(url, stream=True, timeout=REQUEST_TIMEOUT) as response:
+            response.raise_for_status()
+
+            total_size = body_size(response)
+
+            if total_size > SPOOL_MAX_SIZE:
+                # Too big for memory: move the buffer to disk now and reserve
+                # space for the whole archive up front
+                buffer.rollover()
+                preallocate(buffer, total_size)
+
+            with progress_bar(total_size, extract_to.name) as pbar:
+                copy_response(response, QueueTee(buffer, chunk_queue), pbar, digest)
+
+            # Drop any reserved space (or leftovers from an abandoned segmented
+            # download) past the end of the data, since ZipFile looks for the
+            # central directory at the end of the file
+            buffer.truncate()
+    finally:
+        chunk_queue.put(None)
+        extractor.join()
+
+    if outcome["error"] is not None:
+        raise outcome["error"]
+
+    return response.headers, outcome["extracted"]
+
+
+def download_and_extract_zip(
+    url: str,
+    extract_to: Path,
+    session: requests.Session,
+    num_parts: int = 1,
+    sha256: str | None = None,
+) -> CaseInsensitiveDict:
+    """
+    Download a zip archive and extract it without saving the archive itself.
+
+    The response body is streamed into a SpooledTemporaryFile, which stays in
+    memory for small archives and transparently moves to disk for large ones.
+    This avoids writing, re-reading and deleting a standalone .zip file in the
+    data directory. Single-stream downloads are extracted while they arrive.
+
+    Contents are extracted into a staging directory that replaces extract_to
+    only once everything succeeded, so a failed download never leaves behind
+    a partial directory that later runs would mistake for complete data. The
+    previous data is moved aside and only deleted once the swap has worked.
+    That includes an archive whose SHA-256 digest doesn't match the expected
+    one: streamed archives are hashed on the fly, while segmented downloads
+    arrive out of order and are hashed from the buffer once complete.
+
+    Args:
+        url: The URL of the zip archive
+        extract_to: Directory to extract contents to
+        session: HTTP session to download with
+        num_parts: Number of parallel byte-range requests to split the
+            download into (1 streams the archive over a single connection)
+        sha256: Expected hex digest of the archive, if known
+
+    Returns:
+        CaseInsensitiveDict: Headers of the download response
+    """
+    tqdm.write(f"Downloading {extract_to.name} archive...")
+
+    staging_dir = extract_to.with_name(f".{extract_to.name}.partial")
+    shutil.rmtree(staging_dir, ignore_errors=True)
+
+    try:
+        with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE) as buffer:
+            headers = None
+            extracted = False
+            if num_parts > 1:
+                # Parts are written at their offsets, which needs a real file
+                buffer.rollover()
+                headers = download_file_segmented(
+                    url, buffer, session, num_parts, extract_to.name
+                )
+
+            if headers is not None and sha256:
+                buffer.seek(0)
+                check_sha256(
+                    hashlib.file_digest(buffer, "sha256"), sha256, extract_to.name
+                )
+            elif headers is None:
+                digest = hashlib.sha256() if sha256 else None
+                headers, extracted = stream_and_extract(
+                    url, buffer, staging_dir, session, digest
+                )
+                if digest is not None:
+                    check_sha256(digest, sha256, extract_to.name)
+
+            tqdm.write(f"✓ Downloaded {extract_to.name} archive")
+
+            if not extracted:
+                tqdm.write(f"Extracting {extract_to.name} archive...")
+                shutil.rmtree(staging_dir, ignore_errors=True)
+                buffer.seek(0)
+                extract_zip(buffer, staging_dir)
+
+        if not staging_dir.is_dir() or not any(staging_dir.iterdir()):
+            raise zipfile.BadZipFile(f"{extract_to.name} archive is empty")
+    except BaseException:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        raise
+
+    old_dir = extract_to.with_name(f".{extract_to.name}.old")
+    shutil.rmtree(old_dir, ignore_errors=True)
+    if extract_to.exists():
+        extract_to.rename(old_dir)
+    try:
+        staging_dir.rename(extract_to)
+    except BaseException:
+        if old_dir.exists():
+            old_dir.rename(extract_to)
+        raise
+    shutil.rmtree(old_dir, ignore_errors=True)
+
+    tqdm.write(f"✓ Extracted to {extract_to}")
+
+    return headers
+
+
+def write_metadata(headers: CaseInsensitiveDict, meta_path: Path) -> None:
+    """
+    Save the cache validators of a download next to the data.
 
-    # Skip if data already exists
+    Args:
+        headers: Headers of the download response
+        meta_path: Path of the JSON sidecar file to write
+    """
+    meta = {
+        "etag": headers.get("ETag"),
+        "last_modified": headers.get("Last-Modified"),
+    }
+    meta_path.write_text(json.dumps(meta, indent=2))
+
+
+def is_up_to_date(url: str, meta_path: Path, session: requests.Session) -> bool:
+    """
+    Check whether previously downloaded data still matches the remote file.
+
+    Sends a conditional HEAD request with the saved ETag / Last-Modified
+    validators. A 304 Not Modified (or unchanged validators, for servers that
+    ignore conditional headers) means the local copy is current. Data without
+    saved validators, or a failed check, is treated as up to date so existing
+    data is never thrown away just because the server couldn't be asked.
+
+    Args:
+        url: The URL the data was downloaded from
+        meta_path: Path of the JSON sidecar file with saved validators
+        session: HTTP session to check with
+
+    Returns:
+        bool: True if the existing data can be kept
+    """
+    if not meta_path.exists():
+        return True
+
+    meta = json.loads(meta_path.read_text())
+    headers = {}
+    if meta.get("etag"):
+        headers["If-None-Match"] = meta["etag"]
+    if meta.get("last_modified"):
+        headers["If-Modified-Since"] = meta["last_modified"]
+    if not headers:
+        return True
+
+    try:
+        response = session.head(
+            url, headers=headers, allow_redirects=True, timeout=REQUEST_TIMEOUT
+        )
+        response.raise_for_status()
+    except requests.RequestException as e:
+        tqdm.write(f"⚠ Could not check {url} for updates: {e}")
+        return True
+
+    if response.status_code == 304:
+        return True
+
+    etag = response.headers.get("ETag")
+    last_modified = response.headers.get("Last-Modified")
+    if etag:
+        return etag == meta.get("etag")
+    return last_modified is not None and last_modified == meta.get("last_modified")
+
+
+def download_dataset(dataset: DatasetPlan, session: requests.Session) -> None:
+    """
+    Download and process a single dataset.
+
+    Args:
+        dataset: Resolved download plan for the dataset
+        session: HTTP session to download with
+    """
+    tqdm.write(f"\n{'=' * 60}\nProcessing: {dataset.name}\n{'=' * 60}")
+
+    # Check the extracted directory for archives, the file itself otherwise
+    check_path = dataset.final_dir or dataset.output_path
+
+    # Skip if data already exists and the remote copy hasn't changed
     if check_path.exists():
-        print("⊙ Data already exists, skipping download")
-        return
+        if is_up_to_date(dataset.url, dataset.meta_path, session):
+            tqdm.write(f"⊙ {dataset.name}: data is up to date, skipping download")
+            return
+        tqdm.write(f"↻ {dataset.name}: remote data has changed, downloading again")
 
-    # Download the file
-    download_file(url, output_path)
+    if dataset.final_dir:
+        # Zip archives are extracted straight from the download stream
+        headers = download_and_extract_zip(
+            dataset.url,
+            dataset.final_dir,
+            session,
+            dataset.segments,
+            dataset.sha256,
+        )
+    else:
+        headers = download_file(
+            dataset.url, dataset.output_path, session, dataset.sha256
+        )
 
-    # Extract if it's a zip file
-    if filename.endswith(".zip") and final_dir:
-        final_dir.mkdir(exist_ok=True)
-        extract_zip(output_path, final_dir)
+    write_metadata(headers, dataset.meta_path)
 
 
 def main():
     """Main function to download all GIS datasets."""
-    # Get the project root directory (parent of scripts directory)
-    script_dir = Path(__file__).parent
-    project_root = script_dir.parent
-    data_dir = project_root.joinpath("data")
-
     # Create data directory if it doesn't exist
-    data_dir.mkdir(exist_ok=True)
+    DATA_DIR.mkdir(exist_ok=True)
 
-    print(f"Data will be saved to: {data_dir}")
+    print(f"Data will be saved to: {DATA_DIR}")
 
-    # Download all datasets
-    for name, config in DATASETS.items():
-        try:
-            download_dataset(name, config, data_dir)
-        except Exception as e:
-            print(f"✗ Error downloading {name}: {e}")
-            continue
+    # Download all datasets concurrently. The work is network-bound and the
+    # datasets are independent, so wall time is roughly the slowest download
+    # rather than the sum of all of them. The worker threads share one session
+    # (and therefore one connection pool).
+    with (
+        create_session() as session,
+        ThreadPoolExecutor(max_workers=len(PLAN)) as executor,
+    ):
+        futures = {
+            executor.submit(download_dataset, dataset, session): dataset.name
+            for dataset in PLAN
+        }
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except Exception as e:
+                tqdm.write(f"✗ Error downloading {futures[future]}: {e}")
 
     print(f"\n{'=' * 60}")
     print("✓ All downloads complete!")
     print(f"{'=' * 60}")
-    print(f"\nData saved to: {data_dir}")
+    print(f"\nData saved to: {DATA_DIR}")
 
 
 if __name__ == "__main__":
@@ -2,9 +2,14 @@
 # /// script
 # requires-python = ">=3.14"
 # dependencies = [
+#     "numpy",
 #     "pandas",
-#     "geopandas",
+#     "geopandas>=1.1.1",
+#     "shapely>=2.0",
 #     "matplotlib",
+#     "pyogrio",
+#     "pyarrow",
+#     "pyproj>=3.6",
 # ]
 # ///
 """
@@ -18,12 +23,200 @@ This script processes:
 To determine which areas of residential parcels meet the legal requirements for keeping chickens.
 """
 
+import argparse
+import hashlib
+import math
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+import numpy as np
 import pandas as pd
 import geopandas as gpd
+import pyarrow.parquet as pq
+import pyproj
+import shapely
 import matplotlib.pyplot as plt
 from matplotlib.patches import Patch
 
+# Read and write vector files with pyogrio, which decodes features in bulk
+# instead of one at a time like Fiona
+gpd.options.io_engine = "pyogrio"
+
+# Let matplotlib drop path vertices that don't move the outline by at least a
+# pixel, which keeps drawing tens of thousands of parcels fast
+plt.rcParams["path.simplify"] = True
+plt.rcParams["path.simplify_threshold"] = 1.0
+
+# Chickens must be kept this far from dwellings not occupied by the owner
+DWELLING_BUFFER_DISTANCE = 200
+
+# Segments per quarter circle in the dwelling buffers. Four is well within map
+# accuracy at this distance, and every extra vertex is carried through all of
+# the unions and differences that follow.
+BUFFER_QUAD_SEGS = 4
+
+# Vertices closer than this to the simplified outline are dropped from buffers
+BUFFER_SIMPLIFY_TOLERANCE = 1.0
+
+# Radius the dwelling buffers are built with. Segments and simplification both
+# cut chords across the circle, so the radius is enlarged until the polygon
+# contains the whole DWELLING_BUFFER_DISTANCE circle: a map of where chickens
+# are allowed has to err on the prohibited side.
+DWELLING_BUFFER_REACH = (
+    DWELLING_BUFFER_DISTANCE / math.cos(math.pi / (4 * BUFFER_QUAD_SEGS))
+    + BUFFER_SIMPLIFY_TOLERANCE
+)
+
+# Compression for the Parquet caches in data/.cache. Zstandard makes the
+# geometry-heavy files much smaller than the default Snappy at about the
+# same read speed, so warm starts read less from disk.
+CACHE_COMPRESSION = "zstd"
+
+# Layers saved by the prepared data cache, in the order main() unpacks them
+PREPARED_LAYERS = (
+    "boundary",
+    "residential_parcels",
+    "non_residential_parcels",
+    "buildings",
+)
+
+
+def read_shapefile(path, columns=None):
+    """
+    Read a shapefile with pyogrio, converting features in bulk through Arrow.
+
+    Args:
+        path: Path to the .shp file
+        columns: Attribute columns to read, or None for all of them
+
+    Returns:
+        GeoDataFrame: The shapefile contents
+    """
+    return gpd.read_file(path, engine="pyogrio", use_arrow=True, columns=columns)
+
+
+def read_csv(path, columns=None):
+    """
+    Read a CSV file with pyarrow's multithreaded parser.
+
+    Args:
+        path: Path to the .csv file
+        columns: Columns to read, or None for all of them
+
+    Returns:
+        DataFrame: The CSV contents
+    """
+    return pd.read_csv(path, usecols=columns, engine="pyarrow")
+
+
+def read_cached(source_path, read_source, read_cache, columns=None):
+    """
+    Read a data file through a Parquet copy cached in data/.cache.
+
+    Parsing CSVs and shapefiles dominates start-up time, so the first read
+    of each file saves it as (Geo)Parquet, which later runs load much faster.
+    The cached copy is used only while it is newer than the source file, so
+    re-downloaded data is picked up automatically.
+
+    Only the given columns are read, so unused attributes are never decoded
+    or carried through the pipeline. A cached copy missing any of them is
+    rebuilt from the source.
+
+    Args:
+        source_path: Path to the source data file
+        read_source: Function reading the source file into a (Geo)DataFrame,
+            taking the columns to read as a keyword argument
+        read_cache: Function reading the cached Parquet file back
+            (pd.read_parquet or gpd.read_parquet)
+        columns: Columns to read, or None for all of them
+
+    Returns:
+        DataFrame or GeoDataFrame: The file contents
+    """
+    cache_dir = Path(__file__).parent.parent / "data" / ".cache"
+    cache_path = cache_dir / f"{source_path.stem}.parquet"
+
+    if (
+        cache_path.exists()
+        and cache_path.stat().st_mtime >= source_path.stat().st_mtime
+        and (columns is None or set(columns).issubset(pq.read_schema(cache_path).names))
+    ):
+        return read_cache(cache_path, columns=columns)
+
+    df = read_source(source_path, columns=columns)
+
+    cache_dir.mkdir(exist_ok=True)
+    df.to_parquet(cache_path, compression=CACHE_COMPRESSION)
+
+    return df
+
+
+def prepared_cache_dir(data_dir):
+    """
+    Get the cache directory for data prepared from the current input files.
+
+    The directory name is a hash of the size and modification time of every
+    input file and of this script, so changing any of them (re-downloading
+    data or editing the preparation code) starts a fresh cache.
+
+    Args:
+        data_dir: Path to the data directory
+
+    Returns:
+        Path: Cache directory for the prepared data
+    """
+    input_paths = [
+        Path(__file__),
+        data_dir / "land_use_codes.csv",
+        data_dir / "boundary" / "Boundary.shp",
+        data_dir / "parcels" / "Alexandria_Parcels.shp",
+        data_dir / "buildings" / "Buildings.shp",
+        data_dir / "buildings-use.csv",
+    ]
+
+    digest = hashlib.sha256()
+    for path in input_paths:
+        stat = path.stat()
+        digest.update(f"{path.name}:{stat.st_size}:{stat.st_mtime_ns}\n".encode())
+
+    return data_dir / ".cache" / f"prepared-{digest.hexdigest()[:12]}"
+
+
+def read_prepared_data(cache_dir):
+    """
+    Read the prepared layers back from the cache, if all of them are there.
+
+    Args:
+        cache_dir: Cache directory from prepared_cache_dir()
+
+    Returns:
+        tuple or None: The GeoDataFrames named in PREPARED_LAYERS, or None if
+            the cache is missing or incomplete
+    """
+    cache_paths = [cache_dir / f"{name}.parquet" for name in PREPARED_LAYERS]
+    if not all(path.exists() for path in cache_paths):
+        return None
+
+    return tuple(gpd.read_parquet(path) for path in cache_paths)
+
+
+def write_prepared_data(cache_dir, *layers):
+    """
+    Save the prepared layers as GeoParquet, replacing caches of older inputs.
+
+    Args:
+        cache_dir: Cache directory from prepared_cache_dir()
+        *layers: The GeoDataFrames named in PREPARED_LAYERS, in that order
+    """
+    for stale_dir in cache_dir.parent.glob("prepared-*"):
+        if stale_dir != cache_dir:
+            shutil.rmtree(stale_dir)
+
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    for name, layer in zip(PREPARED_LAYERS, layers, strict=True):
+        layer.to_parquet(cache_dir / f"{name}.parquet", compression=CACHE_COMPRESSION)
+
 
 def read_data():
     """
@@ -42,22 +235,39 @@ def read_data():
     # Read land use codes CSV
     land_use_path = data_dir / "land_use_codes.csv"
     print(f"Reading land use codes from {land_use_path}")
-    land_use_df = pd.read_csv(land_use_path)
+    land_use_df = read_cached(
+        land_use_path,
+        read_csv,
+        pd.read_parquet,
+        columns=["ZONING", "DESCRIPTION"],
+    )
 
     # Read boundary shapefile
     boundary_path = data_dir / "boundary" / "Boundary.shp"
     print(f"Reading parcels from {boundary_path}")
-    boundary_gdf = gpd.read_file(boundary_path)
+    boundary_gdf = read_cached(
+        boundary_path, read_shapefile, gpd.read_parquet, columns=["geometry"]
+    )
 
     # Read parcels shapefile
     parcels_path = data_dir / "parcels" / "Alexandria_Parcels.shp"
     print(f"Reading parcels from {parcels_path}")
-    parcels_gdf = gpd.read_file(parcels_path)
+    parcels_gdf = read_cached(
+        parcels_path,
+        read_shapefile,
+        gpd.read_parquet,
+        columns=["OBJECTID", "ZONING", "geometry"],
+    )
 
     # Read buildings shapefile
     buildings_path = data_dir / "buildings" / "Buildings.shp"
     print(f"Reading buildings from {buildings_path}")
-    buildings_gdf = gpd.read_file(buildings_path)
+    buildings_gdf = read_cached(
+        buildings_path,
+        read_shapefile,
+        gpd.read_parquet,
+        columns=["FACILITYID", "geometry"],
+    )
 
     print("\nData loaded successfully:")
     print(f"  - Land use codes: {len(land_use_df)} rows")
@@ -90,15 +300,20 @@ def prepare_data(land_use_df, boundary_gdf, parcels_gdf, buildings_gdf):
     print(f"  Buildings CRS: {buildings_gdf.crs}")
 
     # Use the parcels CRS as the standard (should be Alexandria's local projection)
-    target_crs = parcels_gdf.crs
+    # Resolve it to a pyproj CRS once, so every comparison and reprojection
+    # below reuses the same parsed object instead of re-parsing user input
+    target_crs = pyproj.CRS.from_user_input(parcels_gdf.crs)
     print(f"\n  Standardizing all data to CRS: {target_crs}")
 
-    # Convert all GeoDataFrames to the same CRS
-    if boundary_gdf.crs != target_crs:
+    # Convert all GeoDataFrames to the same CRS. Compare ignoring axis order:
+    # geopandas always stores x/y, so a CRS differing only in its declared
+    # axis order (or spelled as different but equivalent WKT) needs no
+    # reprojection. geopandas caches the transformer for the ones that do.
+    if not target_crs.equals(boundary_gdf.crs, ignore_axis_order=True):
         boundary_gdf = boundary_gdf.to_crs(target_crs)
         print("    - Boundary converted")
 
-    if buildings_gdf.crs != target_crs:
+    if not target_crs.equals(buildings_gdf.crs, ignore_axis_order=True):
         buildings_gdf = buildings_gdf.to_crs(target_crs)
         print("    - Buildings converted")
 
@@ -106,21 +321,35 @@ def prepare_data(land_use_df, boundary_gdf, parcels_gdf, buildings_gdf):
     print("\n  Merging building use data...")
     data_dir = Path(__file__).parent.parent / "data"
     buildings_use_path = data_dir / "buildings-use.csv"
-    buildings_use_df = pd.read_csv(buildings_use_path)
+    buildings_use_df = read_cached(
+        buildings_use_path,
+        read_csv,
+        pd.read_parquet,
+        columns=["FACILITYID", "UUSE", "UNITS"],
+    )
 
     print(f"    - Loaded {len(buildings_use_df)} building use records")
     print(f"    - Buildings before merge: {len(buildings_gdf)}")
 
     # Merge building use data with buildings (keeping all buildings even if no use data)
+    # Each building must match at most one use record; a duplicated FACILITYID
+    # would otherwise silently duplicate buildings
     buildings_gdf = buildings_gdf.merge(
-        buildings_use_df[["FACILITYID", "UUSE", "SIZE", "UNITS", "OWNERSHIP"]],
+        buildings_use_df,
         on="FACILITYID",
         how="left",
+        validate="m:1",
     )
 
     # Rename UUSE to USE for consistency with spec
     buildings_gdf = buildings_gdf.rename(columns={"UUSE": "USE"})
 
+    # USE and ZONING each hold a handful of distinct codes repeated on every
+    # row. As categoricals, the equality and isin filters on them compare
+    # small integer codes, and string operations run once per distinct code.
+    buildings_gdf["USE"] = buildings_gdf["USE"].astype("category")
+    parcels_gdf["ZONING"] = parcels_gdf["ZONING"].astype("category")
+
     print(f"    - Buildings after merge: {len(buildings_gdf)}")
     print(f"    - Buildings with USE data: {buildings_gdf['USE'].notna().sum()}")
 
@@ -170,24 +399,19 @@ def identify_residential_parcels(parcels_gdf, land_use_df):
 
     # Normalize zoning codes by removing spaces to handle mismatches
     # (e.g., "R 8" in shapefile vs "R8" in CSV)
-    parcels_normalized = parcels_gdf.copy()
-    parcels_normalized["ZONING_NORMALIZED"] = parcels_normalized["ZONING"].str.replace(
-        " ", "", regex=False
-    )
-
-    land_use_normalized = land_use_df.copy()
-    land_use_normalized["ZONING_NORMALIZED"] = land_use_normalized[
-        "ZONING"
-    ].str.replace(" ", "", regex=False)
-
-    # Join parcels with land use codes to get descriptions
-    parcels_with_use = parcels_normalized.merge(
-        land_use_normalized[["ZONING_NORMALIZED", "DESCRIPTION"]],
-        on="ZONING_NORMALIZED",
-        how="left",
+    parcel_zoning = parcels_gdf["ZONING"].str.replace(" ", "", regex=False)
+    land_use_zoning = land_use_df["ZONING"].str.replace(" ", "", regex=False)
+
+    # Zoning codes whose DESCRIPTION contains "residential". Only this set is
+    # needed from the land use codes, so parcels are checked against it with
+    # a hash lookup instead of merging every description onto every parcel.
+    residential_zonings = set(
+        land_use_zoning[
+            land_use_df["DESCRIPTION"].str.contains("residential", case=False, na=False)
+        ]
     )
 
-    print(f"  Total parcels: {len(parcels_with_use)}")
+    print(f"  Total parcels: {len(parcels_gdf)}")
 
     # Filter to residential parcels using multiple criteria:
     # 1. DESCRIPTION contains "residential", OR
@@ -195,16 +419,14 @@ def identify_residential_parcels(parcels_gdf, land_use_df):
     # 3. ZONING is KR, OR
     # 4. ZONING starts with "CDD"
     residential_mask = (
-        parcels_with_use["DESCRIPTION"].str.contains(
-            "residential", case=False, na=False
-        )
-        | parcels_with_use["ZONING_NORMALIZED"].str.upper().eq("W-1")
-        | parcels_with_use["ZONING_NORMALIZED"].str.upper().eq("KR")
-        | parcels_with_use["ZONING_NORMALIZED"].str.upper().str.startswith("CDD")
+        parcel_zoning.isin(residential_zonings)
+        | parcel_zoning.str.upper().eq("W-1")
+        | parcel_zoning.str.upper().eq("KR")
+        | parcel_zoning.str.upper().str.startswith("CDD")
     )
 
-    residential_parcels_gdf = parcels_with_use[residential_mask].copy()
-    non_residential_parcels_gdf = parcels_with_use[~residential_mask].copy()
+    residential_parcels_gdf = parcels_gdf[residential_mask]
+    non_residential_parcels_gdf = parcels_gdf[~residential_mask]
 
     print(f"  Residential parcels: {len(residential_parcels_gdf)}")
     print(f"  Non-residential parcels: {len(non_residential_parcels_gdf)}")
@@ -216,6 +438,39 @@ def identify_residential_parcels(parcels_gdf, land_use_df):
     return residential_parcels_gdf, non_residential_parcels_gdf
 
 
+def filter_buildings_near_parcels(buildings_gdf, residential_parcels_gdf):
+    """
+    Drop buildings too far from any residential parcel to affect the results.
+
+    Only buildings on residential parcels (footprints) or within the buffer
+    distance of one (dwelling buffers) change the allowed areas, so the rest
+    can be dropped before any further processing. Uses a spatial index query
+    on the parcels, so no buffers have to be built for the check. The query
+    distance is the same DWELLING_BUFFER_REACH that buffer_dwellings buffers
+    by, so no building whose buffer touches a residential parcel is dropped.
+
+    Args:
+        buildings_gdf: GeoDataFrame with building footprints
+        residential_parcels_gdf: GeoDataFrame with residential parcels
+
+    Returns:
+        GeoDataFrame: Buildings within DWELLING_BUFFER_REACH of a residential parcel
+    """
+    print("\nFiltering buildings near residential parcels...")
+
+    building_idx, _ = residential_parcels_gdf.sindex.query(
+        buildings_gdf.geometry,
+        predicate="dwithin",
+        distance=DWELLING_BUFFER_REACH,
+    )
+    nearby_buildings_gdf = buildings_gdf.iloc[np.unique(building_idx)]
+
+    print(f"  Total buildings: {len(buildings_gdf)}")
+    print(f"  Buildings near residential parcels: {len(nearby_buildings_gdf)}")
+
+    return nearby_buildings_gdf
+
+
 def identify_dwelling_buildings(buildings_gdf):
     """
     Filter buildings to only those used as dwellings (households and dormitories).
@@ -237,10 +492,10 @@ def identify_dwelling_buildings(buildings_gdf):
     # Filter to household and dormitory buildings
     dwelling_buildings_gdf = buildings_gdf[
         buildings_gdf["USE"].isin(["Household", "Dormitory"])
-    ].copy()
+    ]
 
-    households = len(buildings_gdf[buildings_gdf["USE"] == "Household"])
-    dormitories = len(buildings_gdf[buildings_gdf["USE"] == "Dormitory"])
+    households = buildings_gdf["USE"].eq("Household").sum()
+    dormitories = buildings_gdf["USE"].eq("Dormitory").sum()
 
     print(f"  Dwelling buildings:")
     print(f"    - Household: {households}")
@@ -248,7 +503,8 @@ def identify_dwelling_buildings(buildings_gdf):
     print(f"    - Total: {len(dwelling_buildings_gdf)}")
 
     # Show sample of unique USE types for context
-    use_counts = buildings_gdf["USE"].value_counts().head(10)
+    use_counts = buildings_gdf["USE"].value_counts()
+    use_counts = use_counts[use_counts > 0].head(10)
     print("\n  Top 10 building use types:")
     for use_type, count in use_counts.items():
         print(f"    - {use_type}: {count}")
@@ -256,6 +512,127 @@ def identify_dwelling_buildings(buildings_gdf):
     return dwelling_buildings_gdf
 
 
+def parallel_vectorized(operation, *arrays):
+    """
+    Run an element-wise shapely operation split across a thread pool.
+
+    Shapely's vectorized operations release the GIL while GEOS works, so
+    running chunks of the arrays on separate threads spreads the work
+    across all cores without pickling any geometries.
+
+    Args:
+        operation: Vectorized function of one or more geometry arrays,
+            e.g. shapely.difference
+        *arrays: Aligned arrays of geometries to pass as its operands
+
+    Returns:
+        numpy.ndarray: Element-wise results
+    """
+    num_chunks = min(os.cpu_count() or 1, len(arrays[0]))
+    if num_chunks <= 1:
+        return operation(*arrays)
+
+    with ThreadPoolExecutor(max_workers=num_chunks) as executor:
+        chunks = executor.map(
+            operation, *(np.array_split(array, num_chunks) for array in arrays)
+        )
+        return np.concatenate(list(chunks))
+
+
+def buffer_dwellings(geoms):
+    """
+    Create the prohibited-zone buffers around dwelling footprints.
+
+    Buffers use only BUFFER_QUAD_SEGS segments per quarter circle and are
+    simplified afterwards to keep vertex counts low. Both cut chords across
+    the true circle, so they are built DWELLING_BUFFER_REACH wide, which keeps
+    every point within DWELLING_BUFFER_DISTANCE of the footprint inside the
+    buffer.
+
+    Footprints with identical coordinates (e.g. units of one building
+    digitized as copies) are buffered once and the buffer shared.
+
+    Args:
+        geoms: Array of dwelling footprint geometries
+
+    Returns:
+        numpy.ndarray: Buffer polygons
+    """
+    # Codes number the distinct footprints in order of first appearance
+    codes, _ = pd.factorize(shapely.to_wkb(geoms), use_na_sentinel=False)
+    _, first_idx = np.unique(codes, return_index=True)
+
+    def buffer_and_simplify(footprints):
+        buffers = shapely.buffer(
+            footprints,
+            DWELLING_BUFFER_REACH,
+            quad_segs=BUFFER_QUAD_SEGS,
+            cap_style="round",
+        )
+        return shapely.simplify(
+            buffers, BUFFER_SIMPLIFY_TOLERANCE, preserve_topology=False
+        )
+
+    buffers = parallel_vectorized(buffer_and_simplify, geoms[first_idx])
+    return buffers[codes]
+
+
+def union_by_parcel(geoms, parcel_ids):
+    """
+    Union the geometries belonging to each parcel.
+
+    The geometries are sorted by parcel so each parcel's geometries form one
+    contiguous slice, which is reduced with a single shapely.union_all call.
+    This avoids the per-group overhead of a pandas groupby.
+
+    Args:
+        geoms: Array of geometries
+        parcel_ids: Array with the parcel id of each geometry
+
+    Returns:
+        GeoSeries: Union of the geometries, indexed by parcel id
+    """
+    order = np.argsort(parcel_ids, kind="stable")
+    geoms = geoms[order]
+    unique_ids, starts = np.unique(parcel_ids[order], return_index=True)
+    ends = np.append(starts[1:], len(geoms))
+
+    unions = [shapely.union_all(geoms[start:end]) for start, end in zip(starts, ends)]
+
+    return gpd.GeoSeries(unions, index=unique_ids)
+
+
+def polygonal_parts(geoms):
+    """
+    Drop the lines and points from the results of a polygon intersection.
+
+    Where two polygons only share an edge or a corner (e.g. rowhouses on a
+    parcel line), their intersection is a line or point, or a collection
+    mixing those with polygons. Only the polygonal parts are kept, so every
+    result is a Polygon or MultiPolygon (empty if nothing is left).
+
+    Args:
+        geoms: Array of intersection results
+
+    Returns:
+        numpy.ndarray: Polygonal geometries
+    """
+    geoms = geoms.copy()
+    polygonal_types = (shapely.GeometryType.POLYGON, shapely.GeometryType.MULTIPOLYGON)
+    mixed = np.flatnonzero(~np.isin(shapely.get_type_id(geoms), polygonal_types))
+
+    parts, part_idx = shapely.get_parts(geoms[mixed], return_index=True)
+    is_polygon = shapely.get_dimensions(parts) == 2
+    polygons = shapely.multipolygons(
+        parts[is_polygon],
+        indices=part_idx[is_polygon],
+        out=np.full(len(mixed), None, dtype=object),
+    )
+
+    geoms[mixed] = np.where(shapely.is_missing(polygons), shapely.Polygon(), polygons)
+    return geoms
+
+
 def calculate_allowed_areas(
     residential_parcels_gdf, dwelling_buildings_gdf, all_buildings_gdf
 ):
@@ -266,7 +643,9 @@ def calculate_allowed_areas(
     1. Within 200 feet of dwellings not occupied by the owner
     2. Inside any building (chickens are kept outdoors)
 
-    This function uses spatial indexing to efficiently process large datasets.
+    This function uses spatial indexing to efficiently process large datasets,
+    and computes the per-parcel overlays with vectorized shapely operations
+    over whole arrays of parcels rather than one parcel at a time.
 
     Args:
         residential_parcels_gdf: GeoDataFrame with residential parcels
@@ -282,196 +661,193 @@ def calculate_allowed_areas(
     """
     print("\nCalculating allowed areas for chicken keeping...")
 
-    # Spatial join: which dwellings are on which parcels
-    print("  Performing spatial join of dwellings to parcels...")
-
-    # Keep all columns to maintain index_right convention
-    dwellings_on_parcels = gpd.sjoin(
-        dwelling_buildings_gdf,
-        residential_parcels_gdf[["OBJECTID", "geometry"]],
-        how="inner",
-        predicate="within",
+    # Query a spatial index of the parcels directly instead of going through
+    # gpd.sjoin, which would concatenate every column of both sides; only the
+    # (feature, parcel) index pairs are needed here. The frame's cached
+    # sindex is the tree filter_buildings_near_parcels already built, so all
+    # the queries share one index.
+    parcel_ids = residential_parcels_gdf["OBJECTID"]
+    parcel_geoms = residential_parcels_gdf.geometry.values.to_numpy()
+    parcel_tree = residential_parcels_gdf.sindex
+    num_parcels = len(parcel_geoms)
+
+    # Which dwellings are on which parcels
+    print("  Matching dwellings to parcels...")
+    dwelling_idx, dwelling_parcel_idx = parcel_tree.query(
+        dwelling_buildings_gdf.geometry.values.to_numpy(), predicate="within"
+    )
+    dwellings_on_parcels = pd.DataFrame(
+        {
+            "FACILITYID": dwelling_buildings_gdf["FACILITYID"].to_numpy()[dwelling_idx],
+            "USE": dwelling_buildings_gdf["USE"].to_numpy()[dwelling_idx],
+            "UNITS": dwelling_buildings_gdf["UNITS"].to_numpy()[dwelling_idx],
+            "parcel_id": parcel_ids.to_numpy()[dwelling_parcel_idx],
+        }
     )
     print(f"    - {len(dwellings_on_parcels)} dwellings matched to residential parcels")
 
-    # Pre-compute dwelling-to-parcel mapping for fast lookup
+    # Flag the parcels with a dwelling on them, by position in parcel_geoms
     print("  Building dwelling-to-parcel lookup...")
-    parcel_to_dwellings = (
-        dwellings_on_parcels.groupby("OBJECTID_right")["FACILITYID"]
-        .apply(set)
-        .to_dict()
-    )
-    print(f"    - Created lookup for {len(parcel_to_dwellings)} parcels with dwellings")
+    has_household = np.zeros(num_parcels, dtype=bool)
+    has_household[dwelling_parcel_idx] = True
+    print(f"    - Created lookup for {has_household.sum()} parcels with dwellings")
 
     # Calculate how many residential parcels have no households
-    parcels_without_households = len(residential_parcels_gdf) - len(parcel_to_dwellings)
+    parcels_without_households = num_parcels - has_household.sum()
     print(f"    - Residential parcels without households: {parcels_without_households}")
 
     # Also create mapping of parcel to whether it has multi-unit buildings
     print("  Identifying multi-unit buildings...")
 
-    def check_multiunit(group):
-        """Check if a parcel has multi-unit buildings or dormitories."""
-        # Dormitories are always multi-unit (data may incorrectly show UNITS=1)
-        has_dormitory = (group["USE"] == "Dormitory").any()
-        # Buildings with UNITS > 1
-        has_multiunit = (group["UNITS"] > 1).any()
-        return has_dormitory or has_multiunit
-
-    parcel_to_has_multiunit = (
-        dwellings_on_parcels.groupby("OBJECTID_right")
-        .apply(check_multiunit)
-        .to_dict()
-    )
-    multi_unit_parcel_count = sum(parcel_to_has_multiunit.values())
+    # Dormitories are always multi-unit (data may incorrectly show UNITS=1)
+    is_dormitory = dwellings_on_parcels["USE"].eq("Dormitory")
+    # Buildings with UNITS > 1
+    has_multiple_units = dwellings_on_parcels["UNITS"].gt(1)
+    is_multiunit = (is_dormitory | has_multiple_units).to_numpy()
+    parcel_has_multiunit = np.zeros(num_parcels, dtype=bool)
+    parcel_has_multiunit[dwelling_parcel_idx[is_multiunit]] = True
+    multi_unit_parcel_count = parcel_has_multiunit.sum()
     print(f"    - Found {multi_unit_parcel_count} parcels with multi-unit buildings or dormitories")
 
     # Create 200-foot buffers around all dwellings
     print("  Creating 200-foot buffers around all dwellings...")
-    dwelling_buffers = dwelling_buildings_gdf.geometry.buffer(200, cap_style="round")
-
-    # Create GeoDataFrame of buffers for spatial indexing
-    dwelling_buffers_gdf = gpd.GeoDataFrame(
-        dwelling_buildings_gdf[["FACILITYID"]].copy(),
-        geometry=dwelling_buffers,
-        crs=dwelling_buildings_gdf.crs,
+    dwelling_buffers = buffer_dwellings(
+        dwelling_buildings_gdf.geometry.values.to_numpy()
     )
-    print(f"    - Created {len(dwelling_buffers_gdf)} buffers")
+    print(f"    - Created {len(dwelling_buffers)} buffers")
 
-    # Spatial join: which buffers intersect which parcels (uses spatial index)
+    # Which buffers intersect which parcels (uses spatial index)
     print("  Finding buffers that intersect parcels (using spatial index)...")
-    # Reset index of parcels to ensure OBJECTID is a column, not index
-    parcels_for_join = residential_parcels_gdf[["OBJECTID", "geometry"]].reset_index(
-        drop=True
+    buffer_idx, buffer_parcel_idx = parcel_tree.query(
+        dwelling_buffers, predicate="intersects"
     )
-
-    buffers_intersecting_parcels = gpd.sjoin(
-        dwelling_buffers_gdf, parcels_for_join, how="inner", predicate="intersects"
+    buffers_intersecting_parcels = pd.DataFrame(
+        {
+            "FACILITYID": dwelling_buildings_gdf["FACILITYID"].to_numpy()[buffer_idx],
+            "geometry": dwelling_buffers[buffer_idx],
+            "parcel_id": parcel_ids.to_numpy()[buffer_parcel_idx],
+        }
     )
     print(
         f"    - Found {len(buffers_intersecting_parcels)} buffer-parcel intersections"
     )
 
-    # Group by parcel for efficient processing
-    print("  Processing parcels in groups...")
-    results = []
-
-    # Create a mapping of parcel_id to buffers that should be subtracted
-    parcel_to_prohibited_buffers = {}
-
-    # After sjoin, OBJECTID from the right dataframe should be in the result
-    # Check if we need to use OBJECTID or OBJECTID_right
-    parcel_id_col = (
-        "OBJECTID"
-        if "OBJECTID_right" not in buffers_intersecting_parcels.columns
-        else "OBJECTID_right"
-    )
-
-    for parcel_id, group in buffers_intersecting_parcels.groupby(parcel_id_col):
-        # Get dwellings that are ON this parcel
-        dwellings_on_this_parcel = parcel_to_dwellings.get(parcel_id, set())
-        num_dwellings_on_parcel = len(dwellings_on_this_parcel)
-        has_multiunit_building = parcel_to_has_multiunit.get(parcel_id, False)
-
-        # Determine which buffers to include based on number of dwellings and units
-        # A parcel has "multiple occupancies" if:
-        # 1. It has multiple dwelling buildings, OR
-        # 2. It has any dwelling building with multiple units (e.g., condos, apartments)
-        is_multiple_occupancy = (num_dwellings_on_parcel > 1) or has_multiunit_building
-
-        if not is_multiple_occupancy:
-            # Single dwelling, single unit: exclude buffer from the one dwelling on this parcel
-            # (Owner-occupied single-family home - can keep chickens within 200ft of own dwelling)
-            buffer_indices = group[
-                ~group["FACILITYID"].isin(dwellings_on_this_parcel)
-            ].index
-        else:
-            # Multiple occupancies: include ALL buffers, even those from dwellings on same parcel
-            # (Each unit/dwelling is occupied by different people, so they create prohibited zones)
-            buffer_indices = group.index
-
-        # Store the geometries of buffers to subtract
-        if len(buffer_indices) > 0:
-            parcel_to_prohibited_buffers[parcel_id] = dwelling_buffers_gdf.loc[
-                buffer_indices, "geometry"
-            ]
-
-    # Spatial join: find which buildings are on which parcels
+    # Key every (dwelling, parcel) pair as one integer, the dwelling's
+    # FACILITYID code times the parcel count plus the parcel's position, so the
+    # per-buffer lookups below are flat numpy operations. Duplicate FACILITYIDs
+    # share a code and so still count as one dwelling.
+    facility_codes, _ = pd.factorize(
+        dwelling_buildings_gdf["FACILITYID"], use_na_sentinel=False
+    )
+    dwelling_keys = np.unique(
+        facility_codes[dwelling_idx] * num_parcels + dwelling_parcel_idx
+    )
+    buffer_keys = facility_codes[buffer_idx] * num_parcels + buffer_parcel_idx
+
+    # Determine which buffers to include based on number of dwellings and units
+    # A parcel has "multiple occupancies" if:
+    # 1. It has multiple dwelling buildings, OR
+    # 2. It has any dwelling building with multiple units (e.g., condos, apartments)
+    print("  Selecting prohibited buffers for each parcel...")
+    num_dwellings_on_parcel = np.bincount(
+        dwelling_keys % num_parcels, minlength=num_parcels
+    )
+    is_multiple_occupancy = (num_dwellings_on_parcel > 1) | parcel_has_multiunit
+
+    # Whether each buffer belongs to a dwelling on the parcel it intersects
+    is_own_dwelling = np.isin(buffer_keys, dwelling_keys)
+
+    # Single dwelling, single unit: exclude buffer from the one dwelling on this parcel
+    # (Owner-occupied single-family home - can keep chickens within 200ft of own dwelling)
+    # Multiple occupancies: include ALL buffers, even those from dwellings on same parcel
+    # (Each unit/dwelling is occupied by different people, so they create prohibited zones)
+    prohibited_buffers = buffers_intersecting_parcels[
+        is_multiple_occupancy[buffer_parcel_idx] | ~is_own_dwelling
+    ]
+
+    # Union the prohibited buffers of each parcel
+    parcel_to_prohibited_buffers = union_by_parcel(
+        prohibited_buffers["geometry"].to_numpy(),
+        prohibited_buffers["parcel_id"].to_numpy(),
+    )
+
+    # Find which buildings are on which parcels
     print("  Finding buildings on parcels...")
-    buildings_on_parcels = gpd.sjoin(
-        all_buildings_gdf,
-        residential_parcels_gdf[["OBJECTID", "geometry"]],
-        how="inner",
-        predicate="intersects",
+    building_geoms = all_buildings_gdf.geometry.values.to_numpy()
+    building_idx, building_parcel_idx = parcel_tree.query(
+        building_geoms, predicate="intersects"
     )
 
-    # Create mapping of parcel to building footprints
-    parcel_to_buildings = {}
-    for parcel_id, group in buildings_on_parcels.groupby("OBJECTID_right"):
-        # The geometry column in the group is already the building geometries
-        parcel_to_buildings[parcel_id] = group.geometry
+    # Union the building footprints on each parcel
+    parcel_to_buildings = union_by_parcel(
+        building_geoms[building_idx], parcel_ids.to_numpy()[building_parcel_idx]
+    )
 
     print(f"    - Found buildings on {len(parcel_to_buildings)} parcels")
 
-    # Process each residential parcel
-    for idx, parcel in residential_parcels_gdf.iterrows():
-        parcel_id = parcel["OBJECTID"]
-
-        # Step 0: Check if parcel has any household buildings
-        # Can't keep backyard chickens without a household on the parcel
-        has_household = parcel_id in parcel_to_dwellings
-
-        if not has_household:
-            # No household on this parcel - entire parcel is prohibited
-            allowed_geom = parcel.geometry.difference(
-                parcel.geometry
-            )  # Creates empty geometry
-            prohibited_geom = parcel.geometry
-        else:
-            # Get buffers that should be subtracted from this parcel
-            prohibited_buffers = parcel_to_prohibited_buffers.get(parcel_id)
-
-            # Step 1: Subtract 200-foot dwelling buffers from parcel
-            if prohibited_buffers is not None and len(prohibited_buffers) > 0:
-                # Union the prohibited buffers
-                prohibited_buffers_union = prohibited_buffers.union_all()
-                # Subtract prohibited buffers from parcel to get allowed area
-                allowed_geom = parcel.geometry.difference(prohibited_buffers_union)
-            else:
-                # No nearby dwellings, entire parcel is allowed (so far)
-                allowed_geom = parcel.geometry
-
-            # Step 2: Also subtract all building footprints (chickens are kept outdoors)
-            buildings_on_this_parcel = parcel_to_buildings.get(parcel_id)
-            if (
-                buildings_on_this_parcel is not None
-                and len(buildings_on_this_parcel) > 0
-            ):
-                # Union all building footprints on this parcel
-                buildings_union = buildings_on_this_parcel.union_all()
-                # Subtract building footprints from allowed area
-                allowed_geom = allowed_geom.difference(buildings_union)
-
-            # Calculate prohibited area
-            prohibited_geom = parcel.geometry.difference(allowed_geom)
-
-        results.append(
-            {
-                "parcel_id": parcel_id,
-                "geometry": parcel.geometry,
-                "allowed_geometry": allowed_geom,
-                "prohibited_geometry": prohibited_geom,
-            }
+    # Process all residential parcels at once
+    print("  Subtracting buffers and buildings from parcels...")
+
+    # Line up the unions with the parcels (None where a parcel has none)
+    buffers_union = parcel_to_prohibited_buffers.reindex(parcel_ids).to_numpy()
+    buildings_union = parcel_to_buildings.reindex(parcel_ids).to_numpy()
+
+    # Step 0: Can't keep backyard chickens without a household on the parcel,
+    # so parcels without one are entirely prohibited.
+    #
+    # Most parcels lie entirely inside the buffers of their neighbors. Checking
+    # that against the prepared buffer unions is much cheaper than an overlay,
+    # so those parcels skip the overlay below.
+    shapely.prepare(buffers_union)
+    fully_prohibited = ~has_household | shapely.covers(buffers_union, parcel_geoms)
+
+    # Everything prohibited on a parcel: the 200-foot dwelling buffers plus all
+    # building footprints (chickens are kept outdoors). union_all skips the
+    # missing (None) entries, so a parcel with neither gets an empty geometry.
+    prohibited_union = shapely.union_all(
+        np.stack([buffers_union, buildings_union]), axis=0
+    )
+    needs_overlay = ~fully_prohibited & ~shapely.is_empty(prohibited_union)
+
+    # Parcels with nothing prohibited are entirely allowed, and fully
+    # prohibited parcels entirely prohibited
+    allowed_geoms = np.where(fully_prohibited, shapely.Polygon(), parcel_geoms)
+    prohibited_geoms = np.where(fully_prohibited, parcel_geoms, shapely.Polygon())
+
+    # Split the remaining parcels with one overlay each way. Buffers and
+    # buildings that only touch a parcel leave lines and points in the
+    # intersection, which are dropped so the prohibited areas stay polygons.
+    allowed_geoms[needs_overlay] = parallel_vectorized(
+        shapely.difference,
+        parcel_geoms[needs_overlay],
+        prohibited_union[needs_overlay],
+    )
+    prohibited_geoms[needs_overlay] = polygonal_parts(
+        parallel_vectorized(
+            shapely.intersection,
+            parcel_geoms[needs_overlay],
+            prohibited_union[needs_overlay],
         )
+    )
 
-    # Create results GeoDataFrame
-    results_gdf = gpd.GeoDataFrame(results, crs=residential_parcels_gdf.crs)
+    # Create results GeoDataFrame. The allowed and prohibited columns are
+    # geometry columns too (not object columns of shapely geometries), so
+    # .is_empty, .area and the like run vectorized on them.
+    crs = residential_parcels_gdf.crs
+    results_gdf = gpd.GeoDataFrame(
+        {
+            "parcel_id": parcel_ids.to_numpy(),
+            "allowed_geometry": gpd.GeoSeries(allowed_geoms, crs=crs),
+            "prohibited_geometry": gpd.GeoSeries(prohibited_geoms, crs=crs),
+        },
+        geometry=gpd.GeoSeries(parcel_geoms, crs=crs),
+    )
 
     print("\n  Results:")
     print(f"    - Total residential parcels processed: {len(results_gdf)}")
 
     # Count parcels with some allowed area
-    has_allowed = results_gdf["allowed_geometry"].apply(lambda g: not g.is_empty).sum()
+    has_allowed = (~results_gdf["allowed_geometry"].is_empty).sum()
     print(f"    - Parcels with some allowed area: {has_allowed}")
     print(f"    - Parcels with no allowed area: {len(results_gdf) - has_allowed}")
 
@@ -496,31 +872,25 @@ def create_visualization_layers(
     print("\nCreating visualization layers...")
 
     # Layer 1: Boundary - city outline
-    boundary_layer = boundary_gdf.copy()
+    boundary_layer = boundary_gdf
     print(f"  - Boundary layer: {len(boundary_layer)} features")
 
     # Layer 2: Non-residential parcels
-    non_res_layer = non_residential_parcels_gdf[["geometry"]].copy()
+    non_res_layer = non_residential_parcels_gdf[["geometry"]]
     print(f"  - Non-residential layer: {len(non_res_layer)} features")
 
     # Layer 3: Prohibited residential areas
-    # Extract prohibited geometries from results
-    prohibited_geoms = []
-    for idx, row in results_gdf.iterrows():
-        if not row["prohibited_geometry"].is_empty:
-            prohibited_geoms.append({"geometry": row["prohibited_geometry"]})
-
-    prohibited_layer = gpd.GeoDataFrame(prohibited_geoms, crs=results_gdf.crs)
+    # Extract the non-empty prohibited geometries from results
+    prohibited_geoms = results_gdf["prohibited_geometry"]
+    prohibited_layer = gpd.GeoDataFrame(
+        geometry=prohibited_geoms[~prohibited_geoms.is_empty]
+    )
     print(f"  - Prohibited residential layer: {len(prohibited_layer)} features")
 
     # Layer 4: Allowed residential areas
-    # Extract allowed geometries from results
-    allowed_geoms = []
-    for idx, row in results_gdf.iterrows():
-        if not row["allowed_geometry"].is_empty:
-            allowed_geoms.append({"geometry": row["allowed_geometry"]})
-
-    allowed_layer = gpd.GeoDataFrame(allowed_geoms, crs=results_gdf.crs)
+    # Extract the non-empty allowed geometries from results
+    allowed_geoms = results_gdf["allowed_geometry"]
+    allowed_layer = gpd.GeoDataFrame(geometry=allowed_geoms[~allowed_geoms.is_empty])
     print(f"  - Allowed residential layer: {len(allowed_layer)} features")
 
     print("  Visualization layers created!")
@@ -560,19 +930,27 @@ def generate_map(
     non_residential_color = "#d1d1d1"
 
     # Plot layers in order (bottom to top)
+    # The filled layers are rasterized, so the SVG embeds them as one bitmap
+    # instead of tens of thousands of vector paths; the boundary stays vector
     # Layer 1: Non-residential parcels (light gray)
     if len(non_res_layer) > 0:
-        non_res_layer.plot(ax=ax, color=non_residential_color, edgecolor="none")
+        non_res_layer.plot(
+            ax=ax, color=non_residential_color, edgecolor="none", rasterized=True
+        )
         print(f"  - Plotted {len(non_res_layer)} non-residential parcels")
 
     # Layer 2: Prohibited residential areas (dark gray)
     if len(prohibited_layer) > 0:
-        prohibited_layer.plot(ax=ax, color=excluded_color, edgecolor="none")
+        prohibited_layer.plot(
+            ax=ax, color=excluded_color, edgecolor="none", rasterized=True
+        )
         print(f"  - Plotted {len(prohibited_layer)} prohibited areas")
 
     # Layer 3: Allowed residential areas (bright green)
     if len(allowed_layer) > 0:
-        allowed_layer.plot(ax=ax, color=permitted_color, edgecolor="none")
+        allowed_layer.plot(
+            ax=ax, color=permitted_color, edgecolor="none", rasterized=True
+        )
         print(f"  - Plotted {len(allowed_layer)} allowed areas")
 
     # Layer 4: Boundary outline (black, 2pt line)
@@ -638,7 +1016,8 @@ def generate_map(
 
     # Save as SVG
     svg_path = output_dir / "chicken_map.svg"
-    plt.savefig(svg_path, format="svg", bbox_inches="tight")
+    # Rasterized layers are rendered at this resolution inside the SVG
+    plt.savefig(svg_path, format="svg", dpi=300, bbox_inches="tight")
     print(f"  Saved SVG to: {svg_path}")
 
     print("  Map generation complete!")
@@ -671,9 +1050,11 @@ def generate_diagnostic_map(
 
     # Create 200-foot buffers around dwelling buildings
     print("  Creating 200-foot buffers...")
-    dwelling_buffers = dwelling_buildings_gdf.geometry.buffer(200, cap_style="round")
+    dwelling_buffers = buffer_dwellings(
+        dwelling_buildings_gdf.geometry.values.to_numpy()
+    )
     dwelling_buffers_gdf = gpd.GeoDataFrame(
-        dwelling_buildings_gdf[["FACILITYID"]].copy(),
+        dwelling_buildings_gdf[["FACILITYID"]],
         geometry=dwelling_buffers,
         crs=dwelling_buildings_gdf.crs,
     )
@@ -770,18 +1151,22 @@ def generate_diagnostic_map(
     return fig
 
 
-def export_shapefile(results_gdf, output_path):
+def export_geoparquet(results_gdf, output_path):
     """
-    Export the complete results GeoDataFrame as a shapefile.
+    Export the complete results GeoDataFrame as GeoParquet.
+
+    GeoParquet keeps all three geometry columns as real geometries under
+    their full names, and is much faster to write and read back than a
+    GIS vector format.
 
     Args:
         results_gdf: GeoDataFrame with parcel_id, geometry, allowed_geometry, prohibited_geometry
-        output_path: Path where the shapefile should be saved
+        output_path: Path where the GeoParquet file should be saved
 
     Returns:
-        Path: The output path where the shapefile was saved
+        Path: The output path where the GeoParquet file was saved
     """
-    print("\nExporting results to shapefile...")
+    print("\nExporting results to GeoParquet...")
 
     # Ensure output path is a Path object
     output_path = Path(output_path)
@@ -789,51 +1174,129 @@ def export_shapefile(results_gdf, output_path):
     # Create output directory if it doesn't exist
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    # Export the complete results GeoDataFrame
-    # Note: Shapefiles have column name limitations (10 chars max), so we'll use shorter names
-    export_gdf = results_gdf.copy()
-    export_gdf = export_gdf.rename(
-        columns={
-            "parcel_id": "PARCEL_ID",
-            "allowed_geometry": "ALLOWED_GM",
-            "prohibited_geometry": "PROHIB_GM",
-        }
+    results_gdf.to_parquet(output_path)
+
+    print(f"  Exported {len(results_gdf)} parcels to: {output_path}")
+    print(
+        "  GeoParquet includes: parcel_id, geometry, allowed_geometry, prohibited_geometry"
     )
 
-    # Export to shapefile
-    export_gdf.to_file(output_path)
+    return output_path
+
+
+def export_geopackage(results_gdf, output_path):
+    """
+    Export the results as a GeoPackage with one layer per geometry.
 
-    print(f"  Exported {len(export_gdf)} parcels to: {output_path}")
-    print("  Shapefile includes: geometry, PARCEL_ID, ALLOWED_GM, PROHIB_GM")
+    A shapefile holds a single geometry column, so the allowed and prohibited
+    geometries used to be written as truncated WKT text. A GeoPackage stores
+    each of them as a proper geometry layer instead.
+
+    Args:
+        results_gdf: GeoDataFrame with parcel_id, geometry, allowed_geometry, prohibited_geometry
+        output_path: Path where the GeoPackage should be saved
+
+    Returns:
+        Path: The output path where the GeoPackage was saved
+    """
+    print("\nExporting results to GeoPackage...")
+
+    # Ensure output path is a Path object
+    output_path = Path(output_path)
+
+    # Create output directory if it doesn't exist
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    # Overwrite the file rather than appending layers to a previous run's
+    output_path.unlink(missing_ok=True)
+
+    # Write each geometry column as its own layer keyed by parcel_id
+    layers = {
+        "parcels": "geometry",
+        "allowed": "allowed_geometry",
+        "prohibited": "prohibited_geometry",
+    }
+    for layer, geometry_column in layers.items():
+        layer_gdf = gpd.GeoDataFrame(
+            {"parcel_id": results_gdf["parcel_id"]},
+            geometry=results_gdf[geometry_column],
+        )
+        layer_gdf.to_file(output_path, layer=layer, driver="GPKG", engine="pyogrio")
+
+    print(f"  Exported {len(results_gdf)} parcels to: {output_path}")
+    print(f"  GeoPackage layers: {', '.join(layers)}")
 
     return output_path
 
 
 def main():
     """Main entry point for the script."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--rebuild-cache",
+        action="store_true",
+        help="ignore and rebuild all cached data in data/.cache",
+    )
+    args = parser.parse_args()
+
     print("=" * 60)
     print("ALEXANDRIA CHICKEN MAP GENERATOR")
     print("=" * 60)
 
-    # Step 1: Read all data files
-    land_use_df, boundary_gdf, parcels_gdf, buildings_gdf = read_data()
+    data_dir = Path(__file__).parent.parent / "data"
+    if args.rebuild_cache:
+        shutil.rmtree(data_dir / ".cache", ignore_errors=True)
 
-    # Step 2: Prepare data (standardize CRS, merge building use data)
-    land_use_df, boundary_gdf, parcels_gdf, buildings_gdf = prepare_data(
-        land_use_df, boundary_gdf, parcels_gdf, buildings_gdf
-    )
+    # Steps 1-3 depend only on the input files, so their results are cached
+    # and reused until one of the inputs changes
+    cache_dir = prepared_cache_dir(data_dir)
+    prepared = read_prepared_data(cache_dir)
 
-    # Step 3: Identify residential parcels
-    residential_parcels_gdf, non_residential_parcels_gdf = identify_residential_parcels(
-        parcels_gdf, land_use_df
-    )
+    if prepared is not None:
+        print(f"\nLoaded prepared data from {cache_dir}")
+        (
+            boundary_gdf,
+            residential_parcels_gdf,
+            non_residential_parcels_gdf,
+            buildings_gdf,
+        ) = prepared
+    else:
+        # Step 1: Read all data files
+        land_use_df, boundary_gdf, parcels_gdf, buildings_gdf = read_data()
+
+        # Step 2: Prepare data (standardize CRS, merge building use data)
+        land_use_df, boundary_gdf, parcels_gdf, buildings_gdf = prepare_data(
+            land_use_df, boundary_gdf, parcels_gdf, buildings_gdf
+        )
+
+        # Step 3: Identify residential parcels
+        residential_parcels_gdf, non_residential_parcels_gdf = (
+            identify_residential_parcels(parcels_gdf, land_use_df)
+        )
+
+        write_prepared_data(
+            cache_dir,
+            boundary_gdf,
+            residential_parcels_gdf,
+            non_residential_parcels_gdf,
+            buildings_gdf,
+        )
 
     # Step 4: Identify dwelling buildings
     dwelling_buildings_gdf = identify_dwelling_buildings(buildings_gdf)
 
+    # Only buildings on or near residential parcels affect the results. The
+    # statistics above and the diagnostic map still cover every building.
+    nearby_buildings_gdf = filter_buildings_near_parcels(
+        buildings_gdf, residential_parcels_gdf
+    )
+    nearby_dwellings_gdf = dwelling_buildings_gdf[
+        dwelling_buildings_gdf.index.isin(nearby_buildings_gdf.index)
+    ]
+
     # Step 5: Calculate allowed areas (core logic)
     results_gdf = calculate_allowed_areas(
-        residential_parcels_gdf, dwelling_buildings_gdf, buildings_gdf
+        residential_parcels_gdf, nearby_dwellings_gdf, nearby_buildings_gdf
     )
 
     # Step 6: Create visualization layers
@@ -859,9 +1322,11 @@ def main():
         boundary_gdf, buildings_gdf, dwelling_buildings_gdf, output_dir
     )
 
-    # Export shapefile
-    shapefile_path = output_dir / "chicken_zones.shp"
-    export_shapefile(results_gdf, shapefile_path)
+    # Export GeoParquet (for analysis) and GeoPackage (for GIS tools)
+    geoparquet_path = output_dir / "chicken_zones.parquet"
+    export_geoparquet(results_gdf, geoparquet_path)
+    geopackage_path = output_dir / "chicken_zones.gpkg"
+    export_geopackage(results_gdf, geopackage_path)
 
     print("\n" + "=" * 60)
     print("PROCESSING COMPLETE!")
@@ -871,7 +1336,8 @@ def main():
     print(f"  - {output_dir / 'chicken_map.png'}")
     print(f"  - {output_dir / 'chicken_map.svg'}")
     print(f"  - {output_dir / 'diagnostic_buildings_buffers.png'}")
-    print(f"  - {output_dir / 'chicken_zones.shp'} (+ associated files)")
+    print(f"  - {geoparquet_path}")
+    print(f"  - {geopackage_path}")
     print("=" * 60)
 
 